@@ -1,38 +1,13 @@
-from fastapi import FastAPI, File, UploadFile, Form
+from fastapi import FastAPI, File, UploadFile, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import uvicorn
 from typing import List, Optional
-# Try to import heavy ML model wrappers; if unavailable provide lightweight fallbacks
-try:
-    from backend.models.text_model import TextEmotionModel
-    from backend.models.audio_model import AudioEmotionModel
-    from backend.models.multimodal import MultimodalModel
-    MODELS_AVAILABLE = True
-except Exception:
-    MODELS_AVAILABLE = False
-
-    class TextEmotionModel:
-        def __init__(self):
-            pass
-
-        def predict(self, text):
-            return ({"neutral": 1.0}, "neutral")
-
-    class AudioEmotionModel:
-        def __init__(self):
-            pass
-
-        def predict_from_bytes(self, data):
-            return ({"neutral": 1.0}, "neutral")
-
-    class MultimodalModel:
-        def __init__(self):
-            pass
-
-        def predict(self, text, audio_bytes):
-            return {"dominant": "neutral", "confidence": 1.0}
+# Model wrappers (and numpy/torch/transformers/librosa behind them) are imported
+# lazily by backend.models.loader on first use, keeping app import cheap.
 from backend.utils.storage import Storage
+from backend.utils.retention import RetentionWorker
+import asyncio
+import os
 import uuid
 
 app = FastAPI(title="AI Mental Health Companion")
@@ -47,7 +22,30 @@ app.add_middleware(
 
 from backend.models.loader import loader
 
-store = Storage(db_path="./backend/data/mood_history.db")
+store = Storage(db_path=os.environ.get("MOOD_DB_PATH", "./backend/data/mood_history.db"))
+retention = RetentionWorker(
+    store,
+    max_age_days=int(os.environ.get("MOOD_RETENTION_DAYS", "90")),
+    archive_dir=os.environ.get("MOOD_ARCHIVE_DIR") or None,
+)
+
+
+@app.on_event("startup")
+async def start_retention():
+    # rolls old entries into daily summaries in the background
+    interval = float(os.environ.get("MOOD_RETENTION_INTERVAL_S", "3600"))
+    app.state.retention_task = asyncio.create_task(retention.run_forever(interval))
+
+
+@app.on_event("shutdown")
+async def stop_retention():
+    task = getattr(app.state, "retention_task", None)
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 
 class TextRequest(BaseModel):
@@ -102,10 +100,40 @@ async def multimodal_analysis(text: str = Form(...), file: UploadFile = File(...
             "fused": fused}
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+
 @app.get("/mood-history")
-def mood_history(limit: Optional[int] = 100):
-    return store.get_entries(limit=limit)
+def mood_history(request: Request, response: Response, limit: Optional[int] = 100, since: Optional[int] = None):
+    # the store version changes on every write, so it identifies the response
+    # for a given URL; unchanged history is answered without reading entries
+    etag = f'"{store.get_version()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    entries = store.get_entries(limit=limit, since=since)
+    if since is not None and len(entries) >= limit:
+        # truncated delta: the client is not yet at this version, so make it
+        # come back with the advanced cursor instead of revalidating
+        del headers["ETag"]
+    response.headers.update(headers)
+    return entries
+
+
+@app.get("/mood-summary")
+def mood_summary(limit: Optional[int] = 90):
+    return store.get_daily_summary(limit=limit)
 
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("backend.app.main:app", host="0.0.0.0", port=8000, reload=True)
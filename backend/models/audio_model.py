@@ -1,5 +1,4 @@
 import io
-import numpy as np
 from typing import Tuple, Dict
 
 LABELS = [f"emotion_{i}" for i in range(8)]  # example audio labels (demo)
@@ -8,6 +7,7 @@ LABELS = [f"emotion_{i}" for i in range(8)]  # example audio labels (demo)
 def extract_mfcc_from_bytes(wav_bytes: bytes, sr: int = 16000, n_mfcc: int = 40):
     try:
         import librosa
+        import numpy as np
     except Exception:
         raise RuntimeError("librosa is required for audio preprocessing")
     data, _ = librosa.load(io.BytesIO(wav_bytes), sr=sr)
@@ -62,7 +62,7 @@ class AudioEmotionModel:
             return self._demo_result()
         try:
             mfcc = extract_mfcc_from_bytes(audio_bytes)
-            x = self.torch.tensor(mfcc[np.newaxis, :, :], dtype=self.torch.float32)
+            x = self.torch.tensor(mfcc[None, :, :], dtype=self.torch.float32)
             with self.torch.no_grad():
                 logits = self.model.net(x)
                 probs = self.torch.softmax(logits.squeeze(), dim=0).cpu().numpy()
@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Optional
+
+from backend.utils.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+
+def _next_month(month: str) -> str:
+    year, mon = int(month[:4]), int(month[5:7])
+    year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return f"{year:04d}-{mon:02d}-01 00:00:00"
+
+
+class RetentionWorker:
+    """Rolls old raw entries into per-day summary rows and keeps the database small.
+
+    The ``entries`` table only holds the last ``max_age_days`` of raw rows. Older
+    rows are counted into ``daily_summary`` and then either copied into one
+    SQLite file per month under ``archive_dir`` or dropped. Work happens in
+    short batches so request writes are never held up for long.
+    """
+    def __init__(self, store: Storage, max_age_days: int = 90, batch_size: int = 500,
+                 archive_dir: Optional[str] = None, vacuum_pages: int = 256):
+        self.store = store
+        self.max_age_days = max_age_days
+        self.batch_size = batch_size
+        self.archive_dir = archive_dir
+        self.vacuum_pages = vacuum_pages
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+
+    def _connect(self):
+        # autocommit mode so ATTACH and the batch transactions are explicit
+        return sqlite3.connect(self.store.db_path, isolation_level=None)
+
+    def _cutoff(self) -> str:
+        return (datetime.utcnow() - timedelta(days=self.max_age_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+    def _roll_batch(self, conn, cutoff: str) -> int:
+        c = conn.cursor()
+        oldest = c.execute("SELECT MIN(timestamp) FROM entries WHERE timestamp < ?", (cutoff,)).fetchone()[0]
+        if oldest is None:
+            return 0
+        # keep every batch inside one calendar month so it maps to one archive file
+        month = oldest[:7]
+        upper = min(cutoff, _next_month(month))
+        attached = False
+        if self.archive_dir:
+            path = os.path.join(self.archive_dir, f"entries-{month}.db")
+            c.execute("ATTACH DATABASE ? AS archive", (path,))
+            attached = True
+        try:
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                c.execute("CREATE TEMP TABLE IF NOT EXISTS retention_batch (seq INTEGER PRIMARY KEY)")
+                c.execute("DELETE FROM retention_batch")
+                c.execute("INSERT INTO retention_batch SELECT seq FROM entries "
+                          "WHERE timestamp < ? ORDER BY timestamp LIMIT ?", (upper, self.batch_size))
+                c.execute(
+                    """
+                INSERT INTO daily_summary (day, entry_type, dominant, count)
+                SELECT date(timestamp), COALESCE(entry_type, ''), COALESCE(dominant, ''), COUNT(*)
+                FROM entries WHERE seq IN (SELECT seq FROM retention_batch)
+                GROUP BY 1, 2, 3
+                ON CONFLICT (day, entry_type, dominant) DO UPDATE SET count = count + excluded.count
+                """
+                )
+                if attached:
+                    c.execute(
+                        """
+                    CREATE TABLE IF NOT EXISTS archive.entries (
+                        id TEXT PRIMARY KEY,
+                        entry_type TEXT,
+                        dominant TEXT,
+                        timestamp DATETIME
+                    )
+                    """
+                    )
+                    c.execute("INSERT OR REPLACE INTO archive.entries (id, entry_type, dominant, timestamp) "
+                              "SELECT id, entry_type, dominant, timestamp FROM entries "
+                              "WHERE seq IN (SELECT seq FROM retention_batch)")
+                c.execute("DELETE FROM entries WHERE seq IN (SELECT seq FROM retention_batch)")
+                rolled = c.rowcount
+                c.execute("COMMIT")
+            except Exception:
+                c.execute("ROLLBACK")
+                raise
+        finally:
+            if attached:
+                c.execute("DETACH DATABASE archive")
+        return rolled
+
+    def _incremental_vacuum(self, conn, max_passes: int = 1000) -> int:
+        c = conn.cursor()
+        if c.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            logger.warning("%s is not in incremental auto-vacuum mode; run "
+                           "`python -m backend.utils.retention --enable-incremental-vacuum` once",
+                           self.store.db_path)
+            return 0
+        freed = 0
+        free = c.execute("PRAGMA freelist_count").fetchone()[0]
+        for _ in range(max_passes):
+            if free == 0:
+                break
+            c.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})").fetchall()
+            remaining = c.execute("PRAGMA freelist_count").fetchone()[0]
+            if remaining >= free:
+                break  # nothing was released; don't spin
+            freed += free - remaining
+            free = remaining
+        c.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+        return freed
+
+    def run_once(self) -> dict:
+        """Roll up everything older than the cutoff, then reclaim free pages."""
+        cutoff = self._cutoff()
+        conn = self._connect()
+        try:
+            rolled = 0
+            while True:
+                n = self._roll_batch(conn, cutoff)
+                if n == 0:
+                    break
+                rolled += n
+            if rolled:
+                self.store.mark_changed()
+            freed = self._incremental_vacuum(conn)
+        finally:
+            conn.close()
+        return {"rolled": rolled, "freed_pages": freed}
+
+    async def run_forever(self, interval_s: float = 3600.0):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("Retention run failed")
+            await asyncio.sleep(interval_s)
+
+
+def enable_incremental_vacuum(db_path: str):
+    """One-off migration: switch an existing file to incremental auto-vacuum.
+
+    Runs a full VACUUM, which rewrites the whole file and blocks writers while
+    it runs, so do it during a maintenance window rather than at app startup.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=os.environ.get("MOOD_DB_PATH", "./backend/data/mood_history.db"))
+    parser.add_argument("--enable-incremental-vacuum", action="store_true")
+    args = parser.parse_args()
+    if args.enable_incremental_vacuum:
+        ok = enable_incremental_vacuum(args.db)
+        print("incremental auto-vacuum enabled" if ok else "failed to enable incremental auto-vacuum")
+    else:
+        print(RetentionWorker(Storage(db_path=args.db)).run_once())
@@ -0,0 +1,142 @@
+"""Import-time and cold-start profiler for the backend.
+
+Runs the app import in a fresh interpreter under ``-X importtime`` and reports
+the modules with the highest cumulative import cost, then measures import time
+and first-request latency in another fresh interpreter.
+
+Usage:
+  python -m backend.utils.startup_profile --top 25
+  python -m backend.utils.startup_profile --check --import-budget-ms 2000 --request-budget-ms 500
+
+With ``--check`` the exit status is non-zero when a budget is exceeded or a
+heavy ML library was imported during startup, so it can gate CI and deploys.
+The profiled app always runs against a throwaway database (``MOOD_DB_PATH``),
+never the real one.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# libraries that must only be loaded by backend.models.loader on first inference
+HEAVY_MODULES = ["numpy", "torch", "torchaudio", "transformers", "librosa", "sklearn"]
+
+
+def _run_isolated(args: List[str]) -> subprocess.CompletedProcess:
+    # point the app's store at a temporary database so profiling never touches
+    # (or migrates) the real mood history file
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, MOOD_DB_PATH=os.path.join(tmp, "mood_history.db"))
+        return subprocess.run([sys.executable] + args, cwd=REPO_ROOT, env=env,
+                              capture_output=True, text=True)
+
+
+def profile_imports(module: str = "backend.app.main") -> List[Tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) for every import, costliest first."""
+    proc = _run_isolated(["-X", "importtime", "-c", f"import {module}"])
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    rows.sort(key=lambda r: r[2], reverse=True)
+    return rows
+
+
+async def _asgi_get(app, path: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    status = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    await app(scope, receive, send)
+    return status.get("code", 0)
+
+
+def _measure_in_process(module: str, path: str):
+    # runs inside the fresh child interpreter started by measure_cold_start
+    start = time.perf_counter()
+    app = importlib.import_module(module).app
+    imported = time.perf_counter()
+    status = asyncio.run(_asgi_get(app, path))
+    done = time.perf_counter()
+    print(json.dumps({
+        "import_ms": round((imported - start) * 1000, 1),
+        "first_request_ms": round((done - imported) * 1000, 1),
+        "status": status,
+        "heavy_modules": [m for m in HEAVY_MODULES if m in sys.modules],
+    }))
+
+
+def measure_cold_start(module: str = "backend.app.main", path: str = "/mood-history") -> dict:
+    """Import the app and serve one request in a fresh interpreter; return timings."""
+    code = ("from backend.utils.startup_profile import _measure_in_process; "
+            f"_measure_in_process({module!r}, {path!r})")
+    proc = _run_isolated(["-c", code])
+    if proc.returncode != 0:
+        raise RuntimeError(f"cold start of {module} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="backend.app.main")
+    parser.add_argument("--path", default="/mood-history")
+    parser.add_argument("--top", default=25, type=int)
+    parser.add_argument("--import-budget-ms", default=2000.0, type=float)
+    parser.add_argument("--request-budget-ms", default=500.0, type=float)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args(argv)
+
+    rows = profile_imports(args.module)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cum_us in rows[:args.top]:
+        print(f"{cum_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    result = measure_cold_start(args.module, args.path)
+    print(f"\nimport {args.module}: {result['import_ms']} ms (budget {args.import_budget_ms} ms)")
+    print(f"first GET {args.path}: {result['first_request_ms']} ms, status {result['status']} "
+          f"(budget {args.request_budget_ms} ms)")
+    if result["heavy_modules"]:
+        print("heavy modules loaded at startup:", ", ".join(result["heavy_modules"]))
+
+    if not args.check:
+        return 0
+    failures = []
+    if result["import_ms"] > args.import_budget_ms:
+        failures.append("import time over budget")
+    if result["first_request_ms"] > args.request_budget_ms:
+        failures.append("first request over budget")
+    if result["status"] != 200:
+        failures.append(f"first request returned {result['status']}")
+    if result["heavy_modules"]:
+        failures.append("heavy modules imported eagerly")
+    for f in failures:
+        print("FAIL:", f)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
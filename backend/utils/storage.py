@@ -1,6 +1,6 @@
 import sqlite3
 import os
-from typing import List
+from typing import List, Optional
 
 
 class Storage:
@@ -12,16 +12,119 @@ class Storage:
     def _init_db(self):
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
+        # incremental auto-vacuum lets the retention worker hand freed pages back
+        # to the filesystem in small steps. This only takes effect for new files;
+        # existing ones are converted once with
+        # `python -m backend.utils.retention --enable-incremental-vacuum`
+        c.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        # WAL keeps readers and request writes going while retention runs
+        c.execute("PRAGMA journal_mode = WAL")
+        columns = [r[1] for r in c.execute("PRAGMA table_info(entries)")]
+        if columns and "seq" not in columns:
+            self._migrate_entries_seq(c)
+        # seq is the history sync cursor; AUTOINCREMENT guarantees it is never
+        # reused, even after retention deletes the newest rows or a VACUUM
         c.execute(
             """
         CREATE TABLE IF NOT EXISTS entries (
-            id TEXT PRIMARY KEY,
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
             entry_type TEXT,
             dominant TEXT,
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
         )
         """
         )
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries (timestamp)")
+        summary_info = list(c.execute("PRAGMA table_info(daily_summary)"))
+        if summary_info and not all(r[3] for r in summary_info):
+            self._migrate_daily_summary_not_null(c)
+        # key columns are NOT NULL because SQLite treats NULLs as distinct in
+        # the primary key, which would break the retention upsert
+        c.execute(
+            """
+        CREATE TABLE IF NOT EXISTS daily_summary (
+            day TEXT NOT NULL,
+            entry_type TEXT NOT NULL,
+            dominant TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, entry_type, dominant)
+        )
+        """
+        )
+        c.execute(
+            """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+        """
+        )
+        c.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+        conn.commit()
+        conn.close()
+
+    def _migrate_entries_seq(self, c):
+        # rebuild pre-seq tables, keeping the old rowids as seq values so
+        # cursors already held by clients stay valid
+        c.execute("BEGIN")
+        c.execute("ALTER TABLE entries RENAME TO entries_old")
+        c.execute(
+            """
+        CREATE TABLE entries (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            entry_type TEXT,
+            dominant TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+        )
+        c.execute("INSERT INTO entries (seq, id, entry_type, dominant, timestamp) "
+                  "SELECT rowid, id, entry_type, dominant, timestamp FROM entries_old")
+        c.execute("DROP TABLE entries_old")
+        c.connection.commit()
+
+    def _migrate_daily_summary_not_null(self, c):
+        # merge rows that were duplicated under NULL keys while rebuilding
+        c.execute("BEGIN")
+        c.execute("ALTER TABLE daily_summary RENAME TO daily_summary_old")
+        c.execute(
+            """
+        CREATE TABLE daily_summary (
+            day TEXT NOT NULL,
+            entry_type TEXT NOT NULL,
+            dominant TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, entry_type, dominant)
+        )
+        """
+        )
+        c.execute("INSERT INTO daily_summary (day, entry_type, dominant, count) "
+                  "SELECT day, COALESCE(entry_type, ''), COALESCE(dominant, ''), SUM(count) "
+                  "FROM daily_summary_old GROUP BY 1, 2, 3")
+        c.execute("DROP TABLE daily_summary_old")
+        c.connection.commit()
+
+    def get_version(self) -> int:
+        """Return the change version of the entries store.
+
+        The version lives in ``meta`` and is bumped in the same transaction as
+        every write, so it is consistent across processes and only costs a
+        primary-key lookup.
+        """
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("SELECT value FROM meta WHERE key = 'version'")
+        version = c.fetchone()[0]
+        conn.close()
+        return version
+
+    def mark_changed(self):
+        """Bump the change version after writes made outside ``save_entry``."""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
         conn.commit()
         conn.close()
 
@@ -30,13 +133,36 @@ class Storage:
         c = conn.cursor()
         c.execute("INSERT OR REPLACE INTO entries (id, entry_type, dominant) VALUES (?, ?, ?)",
                   (entry.get("id"), entry.get("type"), entry.get("dominant")))
+        c.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
         conn.commit()
         conn.close()
 
-    def get_entries(self, limit: int = 100) -> List[dict]:
+    def get_entries(self, limit: int = 100, since: Optional[int] = None) -> List[dict]:
+        """Return history entries, newest first.
+
+        When ``since`` is given only entries with ``seq`` greater than it are
+        returned, oldest first, so a client can page forward by passing the
+        largest ``seq`` it has seen.
+        """
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        if since is None:
+            c.execute("SELECT seq, id, entry_type, dominant, timestamp FROM entries "
+                      "ORDER BY timestamp DESC, seq DESC LIMIT ?", (limit,))
+        else:
+            c.execute("SELECT seq, id, entry_type, dominant, timestamp FROM entries "
+                      "WHERE seq > ? ORDER BY seq ASC LIMIT ?", (since, limit))
+        rows = c.fetchall()
+        conn.close()
+        return [{"seq": r[0], "id": r[1], "type": r[2], "dominant": r[3], "timestamp": r[4]} for r in rows]
+
+    def get_daily_summary(self, limit: int = 90) -> List[dict]:
+        """Return per-day counts of entries rolled up by the retention worker, newest first."""
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
-        c.execute("SELECT id, entry_type, dominant, timestamp FROM entries ORDER BY timestamp DESC LIMIT ?", (limit,))
+        c.execute("SELECT day, entry_type, dominant, count FROM daily_summary "
+                  "WHERE day IN (SELECT DISTINCT day FROM daily_summary ORDER BY day DESC LIMIT ?) "
+                  "ORDER BY day DESC, count DESC", (limit,))
         rows = c.fetchall()
         conn.close()
-        return [{"id": r[0], "type": r[1], "dominant": r[2], "timestamp": r[3]} for r in rows]
+        return [{"day": r[0], "type": r[1], "dominant": r[2], "count": r[3]} for r in rows]
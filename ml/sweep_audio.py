@@ -0,0 +1,224 @@
+"""
+Hyperparameter sweep for the audio model over a shared in-memory feature cache.
+
+The MFCC .npy files are read once, padded/cropped to a fixed number of frames and
+placed in shared memory; worker processes train SimpleAudioNet configurations
+against that cache in parallel, each pinned to its own slice of CPU cores.
+
+Expected usage:
+  python ml/sweep_audio.py --feature_dir ml/audio_features --output_dir ml/models/audio_sweep \
+      --hidden 32,64,128 --lr 1e-3,3e-4 --batch_size 16,32 --threads_per_worker 2
+"""
+import os
+import csv
+import json
+import time
+import argparse
+import itertools
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from torch import nn, optim
+
+from train_audio import SimpleAudioNet, load_feature_paths_and_labels
+
+
+def load_feature_cache(files, labels, max_frames=400):
+    """Stack all feature files into one (N, n_mfcc, T) tensor in shared memory."""
+    arrays = [np.load(f) for f in files]
+    frames = min(max(a.shape[1] for a in arrays), max_frames)
+    n_mfcc = arrays[0].shape[0]
+    x = np.zeros((len(arrays), n_mfcc, frames), dtype=np.float32)
+    for i, a in enumerate(arrays):
+        t = min(a.shape[1], frames)
+        x[i, :, :t] = a[:, :t]
+    features = torch.from_numpy(x).share_memory_()
+    targets = torch.tensor(labels, dtype=torch.long).share_memory_()
+    return features, targets
+
+
+# per-process state set up by _init_worker
+_FEATURES = None
+_TARGETS = None
+
+
+def _init_worker(features, targets, slot_counter, threads):
+    global _FEATURES, _TARGETS
+    _FEATURES, _TARGETS = features, targets
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    with slot_counter.get_lock():
+        slot = slot_counter.value
+        slot_counter.value += 1
+    # pin each worker to its own cores so the pool does not oversubscribe the CPU
+    if hasattr(os, 'sched_setaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+        start = (slot * threads) % len(cpus)
+        os.sched_setaffinity(0, cpus[start:start + threads] or cpus)
+
+
+def _evaluate(model, criterion, x, y, batch_size):
+    model.eval()
+    total_loss, correct = 0.0, 0
+    with torch.no_grad():
+        for i in range(0, len(x), batch_size):
+            xb, yb = x[i:i + batch_size], y[i:i + batch_size]
+            logits = model(xb)
+            total_loss += criterion(logits, yb).item() * len(xb)
+            correct += (logits.argmax(dim=1) == yb).sum().item()
+    return total_loss / len(x), correct / len(x)
+
+
+RESULT_FIELDS = ['hidden', 'lr', 'batch_size', 'epochs_run', 'stopped_early', 'best_epoch',
+                 'val_loss', 'val_acc', 'samples_per_sec', 'train_seconds', 'error']
+
+
+def run_trial(config):
+    """Train one configuration on the shared cache; returns a results row.
+
+    Failures are reported in the row's ``error`` field instead of raising, so one
+    bad configuration does not abort the rest of the sweep.
+    """
+    try:
+        return _train_trial(config)
+    except Exception as e:
+        row = {k: None for k in RESULT_FIELDS}
+        row.update(hidden=config['hidden'], lr=config['lr'], batch_size=config['batch_size'],
+                   error=f'{type(e).__name__}: {e}')
+        return row
+
+
+def _train_trial(config):
+    torch.manual_seed(config['seed'])
+    train_idx = torch.tensor(config['train_idx'])
+    val_idx = torch.tensor(config['val_idx'])
+    x_val, y_val = _FEATURES[val_idx], _TARGETS[val_idx]
+
+    model = SimpleAudioNet(n_mfcc=_FEATURES.shape[1], hidden=config['hidden'], num_classes=config['num_classes'])
+    criterion = nn.CrossEntropyLoss()
+    opt = optim.Adam(model.parameters(), lr=config['lr'])
+    batch_size = config['batch_size']
+
+    best_loss, best_acc, best_epoch = float('inf'), 0.0, 0
+    stale, seen, train_time = 0, 0, 0.0
+    epochs_run = 0
+    for ep in range(config['epochs']):
+        model.train()
+        start = time.perf_counter()
+        perm = train_idx[torch.randperm(len(train_idx))]
+        for i in range(0, len(perm), batch_size):
+            idx = perm[i:i + batch_size]
+            xb, yb = _FEATURES[idx], _TARGETS[idx]
+            opt.zero_grad()
+            loss = criterion(model(xb), yb)
+            loss.backward()
+            opt.step()
+            seen += len(idx)
+        train_time += time.perf_counter() - start
+        epochs_run = ep + 1
+
+        val_loss, val_acc = _evaluate(model, criterion, x_val, y_val, batch_size)
+        if val_loss < best_loss - config['min_delta']:
+            best_loss, best_acc, best_epoch = val_loss, val_acc, epochs_run
+            stale = 0
+        else:
+            stale += 1
+            if stale >= config['patience']:
+                break
+
+    return {
+        'hidden': config['hidden'],
+        'lr': config['lr'],
+        'batch_size': batch_size,
+        'epochs_run': epochs_run,
+        'stopped_early': epochs_run < config['epochs'],
+        'best_epoch': best_epoch,
+        'val_loss': round(best_loss, 6),
+        'val_acc': round(best_acc, 4),
+        'samples_per_sec': round(seen / train_time, 1) if train_time else 0.0,
+        'train_seconds': round(train_time, 2),
+        'error': '',
+    }
+
+
+def sweep(feature_dir, output_dir, hiddens, lrs, batch_sizes, epochs=10, patience=3, min_delta=1e-4,
+          val_fraction=0.2, threads_per_worker=1, workers=None, max_frames=400, num_classes=8, seed=0):
+    os.makedirs(output_dir, exist_ok=True)
+    files, labels = load_feature_paths_and_labels(feature_dir)
+    if len(files) < 2:
+        raise RuntimeError(f'Need at least 2 feature files in {feature_dir}, found {len(files)}')
+    features, targets = load_feature_cache(files, labels, max_frames=max_frames)
+    print(f'Cached {features.shape[0]} samples of shape {tuple(features.shape[1:])} in shared memory')
+
+    order = np.random.default_rng(seed).permutation(len(files))
+    n_val = max(1, int(len(files) * val_fraction))
+    val_idx, train_idx = order[:n_val].tolist(), order[n_val:].tolist()
+
+    configs = [
+        {'hidden': h, 'lr': lr, 'batch_size': bs, 'epochs': epochs, 'patience': patience,
+         'min_delta': min_delta, 'num_classes': num_classes, 'seed': seed,
+         'train_idx': train_idx, 'val_idx': val_idx}
+        for h, lr, bs in itertools.product(hiddens, lrs, batch_sizes)
+    ]
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+    workers = min(workers, len(configs))
+    print(f'Running {len(configs)} trials on {workers} workers x {threads_per_worker} threads')
+
+    # child processes read the thread count at import time, before _init_worker runs
+    os.environ['OMP_NUM_THREADS'] = str(threads_per_worker)
+    os.environ['MKL_NUM_THREADS'] = str(threads_per_worker)
+    ctx = mp.get_context('spawn')
+    slot_counter = ctx.Value('i', 0)
+    results = []
+    with ctx.Pool(workers, initializer=_init_worker,
+                  initargs=(features, targets, slot_counter, threads_per_worker)) as pool:
+        for row in pool.imap_unordered(run_trial, configs):
+            if row['error']:
+                print(f"hidden={row['hidden']} lr={row['lr']} bs={row['batch_size']} FAILED: {row['error']}")
+            else:
+                print(f"hidden={row['hidden']} lr={row['lr']} bs={row['batch_size']} "
+                      f"val_loss={row['val_loss']:.4f} val_acc={row['val_acc']:.3f} "
+                      f"samples/s={row['samples_per_sec']} epochs={row['epochs_run']}")
+            results.append(row)
+
+    # successful trials best first, failed ones at the end
+    results.sort(key=lambda r: (bool(r['error']), r['val_loss'] if r['val_loss'] is not None else 0.0))
+    with open(os.path.join(output_dir, 'sweep_results.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    with open(os.path.join(output_dir, 'sweep_results.json'), 'w') as f:
+        json.dump(results, f, indent=2)
+    failed = sum(1 for r in results if r['error'])
+    if failed:
+        print(f'{failed} of {len(results)} trials failed; see the error column')
+    if failed < len(results):
+        print('Best:', results[0])
+    return results
+
+
+def _parse_list(value, cast):
+    return [cast(v) for v in value.split(',') if v.strip()]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--feature_dir', default='ml/audio_features')
+    parser.add_argument('--output_dir', default='ml/models/audio_sweep')
+    parser.add_argument('--hidden', default='32,64,128')
+    parser.add_argument('--lr', default='1e-3,3e-4')
+    parser.add_argument('--batch_size', default='16,32')
+    parser.add_argument('--epochs', default=10, type=int)
+    parser.add_argument('--patience', default=3, type=int)
+    parser.add_argument('--min_delta', default=1e-4, type=float)
+    parser.add_argument('--val_fraction', default=0.2, type=float)
+    parser.add_argument('--threads_per_worker', default=1, type=int)
+    parser.add_argument('--workers', default=None, type=int)
+    parser.add_argument('--max_frames', default=400, type=int)
+    args = parser.parse_args()
+    sweep(args.feature_dir, args.output_dir,
+          _parse_list(args.hidden, int), _parse_list(args.lr, float), _parse_list(args.batch_size, int),
+          epochs=args.epochs, patience=args.patience, min_delta=args.min_delta,
+          val_fraction=args.val_fraction, threads_per_worker=args.threads_per_worker,
+          workers=args.workers, max_frames=args.max_frames)
@@ -41,7 +41,8 @@ class SimpleAudioNet(nn.Module):
             nn.ReLU(),
             nn.AdaptiveAvgPool1d(32),
         )
-        self.lstm = nn.LSTM(32, hidden, batch_first=True)
+        # the LSTM runs over the 32 pooled time steps with `hidden` conv channels as features
+        self.lstm = nn.LSTM(hidden, hidden, batch_first=True)
         self.fc = nn.Linear(hidden, num_classes)
 
     def forward(self, x):
@@ -2,12 +2,42 @@ import React, {useEffect, useState} from 'react';
 import {View, Text, FlatList, StyleSheet} from 'react-native';
 import AnalysisService from '../services/AnalysisService';
 
+// Kept across mounts so revisiting the screen only downloads new entries.
+const cache = {items: [], etag: null, since: null};
+// Same as the server's default page; also drops rows retention has since removed.
+const PAGE_SIZE = 100;
+
 export default function HistoryScreen(){
-  const [items, setItems] = useState([]);
+  const [items, setItems] = useState(cache.items);
   useEffect(()=>{ fetchHistory() },[]);
   async function fetchHistory(){
-    const res = await AnalysisService.getHistory();
-    setItems(res || []);
+    // work on copies so a failed request leaves the cache untouched
+    let {items: merged, since, etag} = cache;
+    try {
+      while (true) {
+        const res = await AnalysisService.getHistory({since, etag, limit: PAGE_SIZE});
+        if (res.notModified) break;
+        if (since == null) {
+          merged = res.items;
+        } else {
+          // delta responses are oldest first; show newest first and drop replaced ids
+          const fresh = [...res.items].reverse();
+          const freshIds = new Set(fresh.map(i=>i.id));
+          merged = [...fresh, ...merged.filter(i=>!freshIds.has(i.id))];
+        }
+        since = merged.reduce((m, i)=> Math.max(m, i.seq || 0), since || 0);
+        etag = res.etag;
+        // no ETag means the delta was truncated; keep paging from the new cursor
+        if (etag || res.items.length === 0) break;
+      }
+    } catch (e) {
+      setItems(cache.items);
+      return;
+    }
+    cache.items = merged.slice(0, PAGE_SIZE);
+    cache.since = since;
+    cache.etag = etag;
+    setItems(cache.items);
   }
   return (
     <View style={styles.container}>
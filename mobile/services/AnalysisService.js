@@ -39,13 +39,26 @@ async function analyzeAudio(uri){
   return res.json();
 }
 
-async function getHistory(){
-  const res = await fetch(`${API_BASE}/mood-history`, {
+// Conditional/delta fetch of mood history.
+// Returns {notModified, items, etag}; when notModified is true the cached data is current.
+// A delta response without an ETag was truncated at `limit`: fetch again from the new cursor.
+async function getHistory({since, etag, limit = 100} = {}){
+  const query = `?limit=${limit}` + (since != null ? `&since=${since}` : '');
+  const res = await fetch(`${API_BASE}/mood-history${query}`, {
     headers: {
-      ...COMMON_HEADERS
+      ...COMMON_HEADERS,
+      ...(etag ? {'If-None-Match': etag} : {})
     }
   });
-  return res.json();
+  if (res.status === 304) {
+    return { notModified: true, items: [], etag };
+  }
+  if (!res.ok) {
+    const text = await res.text();
+    throw new Error(`Server error ${res.status}: ${text.slice(0, 120)}`);
+  }
+  const items = await res.json();
+  return { notModified: false, items: Array.isArray(items) ? items : [], etag: res.headers.get('ETag') };
 }
 
 export default { analyzeText, analyzeAudio, getHistory };